@@ -4,6 +4,17 @@ import fitz  # PyMuPDF
 import re
 import pandas as pd
 import docx
+import io
+import os
+import time
+import json
+import hashlib
+import uuid
+from bulk_cover_letters import build_cover_letter_archive
+from storage import SessionResultStore, create_shared_backend, make_private_dir
+from text_processing import (split_pasted_job_descriptions, parse_job_file, estimate_tokens, chunk_resume,
+                             parse_dossier, format_dossier)
+from concurrent.futures import ThreadPoolExecutor
 
 # --- 1. Page Configuration ---
 st.set_page_config(
@@ -91,49 +102,294 @@ custom_css = """
 st.markdown(custom_css, unsafe_allow_html=True)
 
 
+# --- App Data Directory ---
+# Session blobs and the default SQLite cache hold resume-derived personal data, so
+# they live in a directory only readable by the user running the app.
+APP_DATA_DIR = os.environ.get("AI_CAREER_TOOLKIT_DATA_DIR", os.path.join(os.path.expanduser("~"), ".cache", "ai_career_toolkit"))
+make_private_dir(APP_DATA_DIR)
+
+# --- Session Result Store ---
+# LLM results are kept out of st.session_state: small values stay in memory,
+# large ones are compressed to a local disk store, and idle sessions are evicted.
+SESSION_STORE_DIR = os.path.join(APP_DATA_DIR, "sessions")
+SESSION_INLINE_LIMIT = 1024  # bytes; larger results are offloaded to disk
+SESSION_TTL_SECONDS = 60 * 60
+SESSION_MAX_ACTIVE = 500
+
+@st.cache_resource
+def get_session_store():
+    return SessionResultStore(SESSION_STORE_DIR, SESSION_INLINE_LIMIT, SESSION_TTL_SECONDS, SESSION_MAX_ACTIVE)
+
+session_store = get_session_store()
+
+def load_result(key, default=""):
+    return session_store.get(st.session_state.session_id, key, default)
+
+def save_result(key, value):
+    session_store.put(st.session_state.session_id, key, value)
+
+
+# --- Shared Cache & Rate-Limit Backend ---
+# Intermediate responses, extraction caches and the Gemini request budget live in a backend
+# shared by every Streamlit worker. CACHE_BACKEND_URL selects it:
+#   sqlite:///path/to/cache.db  (default; shared by all workers on one host)
+#   redis://host:6379/0         (any Redis-compatible server; needs the `redis` package)
+DEFAULT_CACHE_BACKEND_URL = "sqlite:///" + os.path.join(APP_DATA_DIR, "cache.db")
+RESPONSE_CACHE_TTL_SECONDS = 24 * 60 * 60
+EXTRACTION_CACHE_TTL_SECONDS = 24 * 60 * 60
+RATE_LIMIT_WINDOW_SECONDS = 60
+RATE_LIMIT_MAX_WAIT_SECONDS = 90
+
+@st.cache_resource
+def get_shared_backend(url):
+    return create_shared_backend(url)
+
+def get_setting(name, default):
+    try:
+        return st.secrets[name]
+    except Exception:
+        return os.environ.get(name, default)
+
+
 # --- AI Model & State Initialization (Your original code) ---
-if 'general_result' not in st.session_state:
-    st.session_state.general_result = ""
-if 'ats_result' not in st.session_state:
-    st.session_state.ats_result = ""
-if 'roadmap_result' not in st.session_state:
-    st.session_state.roadmap_result = ""
-if 'opportunity_result' not in st.session_state:
-    st.session_state.opportunity_result = ""
-if 'enhanced_resume' not in st.session_state:
-    st.session_state.enhanced_resume = ""
-if 'cover_letter_result' not in st.session_state:
-    st.session_state.cover_letter_result = ""
-if 'trends_result' not in st.session_state:
-    st.session_state.trends_result = None
+if 'session_id' not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
+if 'bulk_cover_letters_count' not in st.session_state:
+    st.session_state.bulk_cover_letters_count = 0
+if 'long_document_stats' not in st.session_state:
+    st.session_state.long_document_stats = None
 if 'app_started' not in st.session_state:
     st.session_state.app_started = False
 
+MODEL_NAME = 'gemini-1.5-flash'
+
 try:
     genai.configure(api_key=st.secrets["GEMINI_API_KEY"])
     generation_config = genai.types.GenerationConfig(temperature=0.2)
-    model = genai.GenerativeModel('gemini-1.5-flash')
+    dossier_generation_config = genai.types.GenerationConfig(temperature=0.2, response_mime_type="application/json")
+    model = genai.GenerativeModel(MODEL_NAME)
 except Exception as e:
     st.error(f"Error configuring AI model: {e}")
     st.stop()
 
+try:
+    shared_backend = get_shared_backend(get_setting("CACHE_BACKEND_URL", DEFAULT_CACHE_BACKEND_URL))
+    gemini_requests_per_minute = int(get_setting("GEMINI_REQUESTS_PER_MINUTE", 15))
+except Exception as e:
+    st.error(f"Error configuring the shared cache backend: {e}")
+    st.stop()
+
 # --- Helper Functions (Your original code) ---
+def cache_key(kind, *parts):
+    digest = hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+    return f"{kind}:{digest}"
+
+def wait_for_rate_limit():
+    # Every worker draws from the same per-minute Gemini budget.
+    deadline = time.time() + RATE_LIMIT_MAX_WAIT_SECONDS
+    while not shared_backend.acquire("gemini", gemini_requests_per_minute, RATE_LIMIT_WINDOW_SECONDS):
+        if time.time() > deadline:
+            raise RuntimeError("The shared Gemini request budget is exhausted. Please try again in a minute.")
+        time.sleep(1)
+
+def response_cache_key(prompt, config):
+    return cache_key("response", MODEL_NAME, str(config.temperature), str(config.response_mime_type), prompt)
+
+def cached_text(prompt, config=None):
+    cached = shared_backend.get(response_cache_key(prompt, config or generation_config))
+    return cached.decode("utf-8") if cached is not None else None
+
+def generate_text_timed(prompt, config=None, cache=False):
+    # Returns (text, seconds, from_cache). seconds covers only the model call, not the
+    # time spent waiting for the shared request budget.
+    config = config or generation_config
+    if cache:
+        cached = cached_text(prompt, config)
+        if cached is not None:
+            return cached, 0.0, True
+    wait_for_rate_limit()
+    started = time.perf_counter()
+    text = model.generate_content(prompt, generation_config=config).text
+    seconds = time.perf_counter() - started
+    if cache:
+        shared_backend.set(response_cache_key(prompt, config), text.encode("utf-8"), RESPONSE_CACHE_TTL_SECONDS)
+    return text, seconds, False
+
+def generate_text(prompt, config=None, cache=False):
+    # Only intermediate calls pass cache=True; user-triggered generations stay fresh on every click.
+    return generate_text_timed(prompt, config, cache)[0]
+
 def extract_text_from_file(file):
     try:
+        data = file.getvalue()
+        key = cache_key("extraction", file.name, hashlib.sha256(data).hexdigest())
+        cached = shared_backend.get(key)
+        if cached is not None:
+            return cached.decode("utf-8")
         if file.name.endswith('.pdf'):
-            doc = fitz.open(stream=file.read(), filetype="pdf")
+            doc = fitz.open(stream=data, filetype="pdf")
             text = "".join(page.get_text() for page in doc)
         elif file.name.endswith('.docx'):
-            doc = docx.Document(file)
+            doc = docx.Document(io.BytesIO(data))
             text = "\n".join([para.text for para in doc.paragraphs])
         else:
             st.error("Unsupported file type.")
             return None
-        return text if text.strip() else None
+        if not text.strip():
+            return None
+        shared_backend.set(key, text.encode("utf-8"), EXTRACTION_CACHE_TTL_SECONDS)
+        return text
     except Exception as e:
         st.error(f"An error occurred while reading the file: {e}")
         return None
 
+# --- Long Document Helpers ---
+# Resumes above LONG_DOCUMENT_TOKEN_THRESHOLD (e.g. academic CVs with long publication
+# lists) are split into section-aligned chunks, condensed in parallel, and the joined
+# notes replace the raw text in the general, ATS and roadmap prompts.
+LONG_DOCUMENT_TOKEN_THRESHOLD = 6000
+CHUNK_TOKEN_BUDGET = 2500
+LONG_DOCUMENT_MAX_WORKERS = 4
+
+def analyze_chunk(index, total, chunk):
+    # Returns (notes, seconds, from_cache) so cache hits can be left out of the timing report.
+    chunk_prompt = f"""
+    You are an expert recruiter's assistant. The text below is part {index} of {total} of a long resume or academic CV.
+    **Instructions:**
+    1.  Extract condensed, factual notes as Markdown bullets, grouped under the section names that appear in the text.
+    2.  Keep every job title, employer, institution, degree and date, and every skill or tool mentioned.
+    3.  Keep quantified achievements with their numbers.
+    4.  Summarize long lists (e.g., publications, talks, courses) into counts, years, venues and the 3 most notable items.
+    5.  Note any obvious weaknesses of this part (vague bullets, missing dates, formatting issues).
+    **Constraint:** Do not invent facts. Do not give advice.
+    ---
+    {chunk}
+    ---
+    """
+    return generate_text_timed(chunk_prompt, cache=True)
+
+def prepare_resume_context(resume_text):
+    # Returns the text to embed in a prompt: the resume itself, or condensed chunk notes
+    # for long documents. Falls back to the full text if the long-document mode fails.
+    if estimate_tokens(resume_text) <= LONG_DOCUMENT_TOKEN_THRESHOLD:
+        return resume_text
+    chunks = chunk_resume(resume_text, CHUNK_TOKEN_BUDGET)
+    started = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=LONG_DOCUMENT_MAX_WORKERS) as executor:
+            results = list(executor.map(analyze_chunk, range(1, len(chunks) + 1), [len(chunks)] * len(chunks), chunks))
+    except Exception as e:
+        st.warning(f"Long-document mode failed, analyzing the full text instead: {e}")
+        return resume_text
+    wall_time = time.perf_counter() - started
+    st.session_state.long_document_stats = {
+        "resume_hash": hashlib.sha256(resume_text.encode("utf-8")).hexdigest(),
+        "chunks": len(chunks),
+        "computed_chunks": sum(1 for _, _, from_cache in results if not from_cache),
+        "tokens": estimate_tokens(resume_text),
+        "wall_time": wall_time,
+        "sequential_time": sum(seconds for _, seconds, _ in results),
+    }
+    notes = "\n\n".join(f"### Part {i} of {len(chunks)}\n{text}" for i, (text, _, _) in enumerate(results, start=1))
+    return f"(This is a long CV that has been condensed into notes, part by part.)\n\n{notes}"
+
+# --- Resume Dossier ---
+# One structured extraction per resume (and target job) that the feedback, roadmap,
+# insights and bulk cover-letter features consume instead of the raw resume text.
+DOSSIER_CACHE_TTL_SECONDS = RESPONSE_CACHE_TTL_SECONDS
+
+def get_resume_dossier(resume_text, target_job):
+    key = cache_key("dossier", MODEL_NAME, hashlib.sha256(resume_text.encode("utf-8")).hexdigest(), target_job or "")
+    cached = shared_backend.get(key)
+    if cached is not None:
+        return parse_dossier(cached.decode("utf-8"))
+    target = f'the target role of "{target_job}"' if target_job else "the roles this resume is best suited for"
+    dossier_prompt = f"""
+    You are an expert technical recruiter. Extract a structured profile of the candidate from the resume below.
+    **Return a single JSON object with exactly these keys:**
+    - "name": the candidate's name.
+    - "contact": the contact details as one string.
+    - "headline": a one-line professional identity.
+    - "seniority": one of "student", "entry", "mid", "senior", "lead", "executive".
+    - "years_of_experience": a number.
+    - "skills": an object with "technical", "tools" and "soft" lists.
+    - "experience": a list of objects with "title", "organization", "start", "end" and "highlights" (up to 3 quantified achievements each), most recent first.
+    - "education": a list of objects with "degree", "institution" and "year".
+    - "strengths": the top 3 strengths.
+    - "weaknesses": the top 3 weaknesses of the candidate or the resume itself (vague bullets, missing metrics, formatting).
+    - "gaps": the top 3-5 skill or experience gaps for {target}.
+    **Constraint:** Do not invent facts. Use empty strings or lists for anything the resume does not state.
+    ---
+    {prepare_resume_context(resume_text)}
+    ---
+    """
+    # The raw reply is not cached; only a profile that parses, validates and renders is stored.
+    dossier = parse_dossier(generate_text(dossier_prompt, dossier_generation_config))
+    format_dossier(dossier)
+    shared_backend.set(key, json.dumps(dossier).encode("utf-8"), DOSSIER_CACHE_TTL_SECONDS)
+    return dossier
+
+def get_resume_profile(resume_text, target_job, include_assessment=True):
+    # Falls back to the (possibly condensed) resume text if the dossier cannot be built.
+    try:
+        return format_dossier(get_resume_dossier(resume_text, target_job), include_assessment)
+    except Exception as e:
+        st.warning(f"Could not build the resume profile, using the full resume instead: {e}")
+        return prepare_resume_context(resume_text)
+
+# --- Bulk Cover Letter Helpers ---
+# Upper bound on concurrent Gemini calls made by the bulk cover-letter mode.
+BULK_COVER_LETTER_MAX_WORKERS = 4
+
+def build_cover_letter_prompt(resume_block, job_description):
+    return f"""
+    You are a professional career writer. Your task is to write a concise and compelling cover letter and suggest an email subject line.
+    **Instructions:**
+    1.  Write a professional email subject line for the application.
+    2.  Write a cover letter (no more than 250 words) that highlights the top 2-3 most relevant skills from the resume that match the job description.
+    **User's Resume:**
+    ---
+    {resume_block}
+    ---
+    **Target Job Description:**
+    ---
+    {job_description}
+    ---
+    """
+
+@st.cache_data(show_spinner=False)
+def parse_job_file_cached(file_name, data):
+    # Keyed by file name and content, so uploaded CSVs are not re-parsed on every rerun.
+    return parse_job_file(file_name, data)
+
+def parse_job_descriptions(pasted_text, uploaded_files):
+    # Returns a list of (name, job_description) pairs from pasted text and uploaded CSV/TXT files.
+    jobs = split_pasted_job_descriptions(pasted_text)
+    for file in uploaded_files or []:
+        try:
+            jobs.extend(parse_job_file_cached(file.name, file.getvalue()))
+        except Exception as e:
+            st.error(f"Could not read job descriptions from {file.name}: {e}")
+    return jobs
+
+def generate_cover_letter(resume_block, job_description):
+    return generate_text(build_cover_letter_prompt(resume_block, job_description))
+
+def save_bulk_cover_letters(archive, generated):
+    save_result("bulk_cover_letters_zip", archive)
+    st.session_state.bulk_cover_letters_count = generated
+
+def generate_bulk_cover_letters(resume_profile, jobs, progress):
+    # Letters are written from the shared resume profile; the archive is saved even if the
+    # run is interrupted, so the letters finished so far can still be downloaded.
+    return build_cover_letter_archive(
+        jobs,
+        lambda jd: generate_cover_letter(resume_profile, jd),
+        BULK_COVER_LETTER_MAX_WORKERS,
+        on_progress=lambda done, total: progress.progress(done / total, text=f"Generated {done} of {total} cover letters..."),
+        on_finish=save_bulk_cover_letters,
+    )
+
 # --- UI LOGIC with Top Dashboard (NO Sidebar) ---
 st.title("✨ AI Career Toolkit")
 
@@ -181,6 +437,7 @@ else:
                 st.info("Get an overall score and general feedback from our AI recruiter.")
                 if st.button("Run General Analysis", type="primary"):
                     with st.spinner("Running general analysis..."):
+                        resume_profile = get_resume_profile(edited_text, target_job)
                         live_editor_prompt = f"""
                         You are a top-tier executive recruiter from a leading tech firm like Google or Goldman Sachs, known for your brutally honest but invaluable feedback. Your task is to conduct a professional-grade analysis of the following resume.
                         **Analysis Steps:**
@@ -190,20 +447,20 @@ else:
                         4.  **Verdict:** In one bolded sentence, state whether you would move forward with this candidate for an interview and why.
                         5.  **Strengths vs. Weaknesses:** Create a two-column Markdown table. The left column will list the top 3 strengths. The right column will list the top 3 weaknesses.
                         6.  **Actionable Improvements:** Provide a bulleted list of the three most critical, specific, and actionable pieces of advice the candidate can implement right now.
-                        **Perform this analysis on the following resume text:**
+                        **Perform this analysis on the following candidate profile, extracted from their resume:**
                         ---
-                        {edited_text}
+                        {resume_profile}
                         ---
                         """
                         try:
-                            response = model.generate_content(live_editor_prompt, generation_config=generation_config)
-                            st.session_state.general_result = response.text
-                            st.session_state.ats_result = "" 
+                            save_result("general_result", generate_text(live_editor_prompt))
+                            save_result("ats_result", "")
                         except Exception as e:
                             st.error(f"An error occurred during analysis: {e}")
                 
-                if st.session_state.general_result:
-                    response_text = st.session_state.general_result
+                general_result = load_result("general_result")
+                if general_result:
+                    response_text = general_result
                     score = 0
                     match = re.search(r'(\d+)\s*/\s*100', response_text)
                     if match:
@@ -219,6 +476,7 @@ else:
                 job_desc_for_ats = st.text_area("Paste the Job Description here for ATS Analysis")
                 if st.button("Run ATS Analysis", disabled=not job_desc_for_ats, type="primary"):
                     with st.spinner("Running ATS simulation..."):
+                        resume_block = prepare_resume_context(edited_text)
                         ats_prompt = f"""
                         You are an advanced Applicant Tracking System (ATS) combined with an expert HR recruiter. Your primary goal is to analyze the provided resume against the provided job description.
                         **Analysis Steps:**
@@ -229,21 +487,21 @@ else:
                         **Perform this ATS analysis:**
                         ---
                         **USER'S RESUME:**
-                        {edited_text}
+                        {resume_block}
                         ---
                         **TARGET JOB DESCRIPTION:**
                         {job_desc_for_ats}
                         ---
                         """
                         try:
-                            response = model.generate_content(ats_prompt, generation_config=generation_config)
-                            st.session_state.ats_result = response.text
-                            st.session_state.general_result = "" 
+                            save_result("ats_result", generate_text(ats_prompt))
+                            save_result("general_result", "")
                         except Exception as e:
                             st.error(f"An error occurred during analysis: {e}")
                 
-                if st.session_state.ats_result:
-                    response_text = st.session_state.ats_result
+                ats_result = load_result("ats_result")
+                if ats_result:
+                    response_text = ats_result
                     score = 0
                     match = re.search(r'(\d+)\s*/\s*100', response_text)
                     if match:
@@ -270,17 +528,17 @@ else:
                         ---
                         """
                         try:
-                            response = model.generate_content(enhancement_prompt, generation_config=generation_config)
-                            st.session_state.enhanced_resume = response.text
+                            save_result("enhanced_resume", generate_text(enhancement_prompt))
                         except Exception as e:
                             st.error(f"An error occurred during enhancement: {e}")
 
-                if st.session_state.enhanced_resume:
+                enhanced_resume = load_result("enhanced_resume")
+                if enhanced_resume:
                     with st.expander("View AI-Enhanced Resume Version", expanded=True):
-                        st.code(st.session_state.enhanced_resume)
+                        st.code(enhanced_resume)
                         st.download_button(
                             label="Download Enhanced Resume as TXT",
-                            data=st.session_state.enhanced_resume,
+                            data=enhanced_resume,
                             file_name="enhanced_resume.txt",
                             mime="text/plain"
                         )
@@ -291,39 +549,41 @@ else:
                 roadmap_personalization = st.text_area("Add any personalizations (e.g., 'create a 60-day plan', 'focus on free courses')")
                 if st.button("Generate My Roadmap", disabled=not target_job, type="primary"):
                     with st.spinner(f"Building your roadmap for {target_job}..."):
+                        resume_profile = get_resume_profile(edited_text, target_job)
                         roadmap_prompt = f"""
                         You are a world-class academic advisor and career coach from an elite university's career services department. Your task is to create a personalized, flexible learning roadmap for a user who wants to become a "{target_job}".
                         **Instructions:**
-                        1.  Analyze the user's resume to identify their current skill level.
+                        1.  Use the candidate profile to identify their current skill level.
                         2.  Identify the top 3 most critical **technical skill gaps**.
                         3.  Identify the single most important **soft skill** they should develop for this role.
                         4.  For each of the 3 technical gaps, create a "Learning Module" containing a concept, a recommended paid course, a free resource, and a portfolio project idea.
                         5.  Create a final "Soft Skill Development" module with actionable advice.
                         6.  **Personalization:** The user has provided the following special request: "{roadmap_personalization}". You must incorporate this request into the plan.
-                        **Generate this roadmap based on the following resume text:**
+                        **Generate this roadmap based on the following candidate profile, extracted from their resume:**
                         ---
-                        {edited_text}
+                        {resume_profile}
                         ---
                         """
                         try:
-                            roadmap_response = model.generate_content(roadmap_prompt, generation_config=generation_config)
-                            st.session_state.roadmap_result = roadmap_response.text
+                            save_result("roadmap_result", generate_text(roadmap_prompt))
                         except Exception as e:
                             st.error(f"An error occurred during roadmap generation: {e}")
                 
-                if not target_job and not st.session_state.roadmap_result:
+                roadmap_result = load_result("roadmap_result")
+                if not target_job and not roadmap_result:
                     st.warning("Please enter a Target Job Title in the sidebar to enable this feature.")
 
-                if st.session_state.roadmap_result:
-                    st.markdown(st.session_state.roadmap_result)
+                if roadmap_result:
+                    st.markdown(roadmap_result)
             
             # --- Tab 3: Your original code with full prompts ---
             with tab3:
                 st.subheader("Career Opportunity & Market Insights")
                 if st.button("Find My Opportunities", disabled=not target_job, type="primary"):
                     with st.spinner("Scanning for career paths..."):
+                        resume_profile = get_resume_profile(edited_text, target_job)
                         opportunity_prompt = f"""
-                        You are a seasoned career strategist and futurist. Analyze the resume for the target role of "{target_job}".
+                        You are a seasoned career strategist and futurist. Analyze the candidate's profile for the target role of "{target_job}".
                         **Analysis:**
                         1.  **Fit Score for Target Role:** Provide a "Fit Score" from 1-100 and a brief justification.
                         2.  **Recruiter's Red Flag:** Identify the single biggest potential "red flag" a recruiter might see in this resume for this specific role and suggest how to mitigate it.
@@ -331,22 +591,22 @@ else:
                             * **Obvious Fit:** The most direct path. Provide an 'Opportunity Score' (1-100) and justification.
                             * **Related Fit:** A similar role in a different industry. Provide score and justification.
                             * **Wildcard Fit:** An unexpected but high-potential role. Provide score and justification.
-                        **Perform this analysis on the following resume text:**
+                        **Perform this analysis on the following candidate profile, extracted from their resume:**
                         ---
-                        {edited_text}
+                        {resume_profile}
                         ---
                         """
                         try:
-                            response = model.generate_content(opportunity_prompt, generation_config=generation_config)
-                            st.session_state.opportunity_result = response.text
+                            save_result("opportunity_result", generate_text(opportunity_prompt))
                         except Exception as e:
                             st.error(f"An error occurred during analysis: {e}")
                 
-                if not target_job and not st.session_state.opportunity_result:
+                opportunity_result = load_result("opportunity_result")
+                if not target_job and not opportunity_result:
                     st.warning("Please enter a Target Job Title in the sidebar to enable this feature.")
 
-                if st.session_state.opportunity_result:
-                    st.markdown(st.session_state.opportunity_result)
+                if opportunity_result:
+                    st.markdown(opportunity_result)
 
                 st.divider()
                 st.subheader("Job Market Future Trends")
@@ -365,16 +625,15 @@ else:
                         Generate the report now.
                         """
                         try:
-                            response = model.generate_content(trends_prompt, generation_config=generation_config)
-                            st.session_state.trends_result = response.text
+                            save_result("trends_result", generate_text(trends_prompt))
                         except Exception as e:
                             st.error(f"An error occurred during trend analysis: {e}")
 
-                if not target_job and not st.session_state.trends_result:
+                trends_text = load_result("trends_result")
+                if not target_job and not trends_text:
                     st.warning("Please enter a Target Job Title in the sidebar to enable this feature.")
 
-                if st.session_state.trends_result:
-                    trends_text = st.session_state.trends_result
+                if trends_text:
                     st.markdown(trends_text)
                     try:
                         table_rows = re.findall(r'\|\s*(\d{4})\s*\|\s*([\d.-]+)\s*\|', trends_text)
@@ -394,34 +653,66 @@ else:
                 job_description = st.text_area("Paste the job description here")
                 if st.button("Generate Cover Letter", disabled=not job_description, type="primary"):
                     with st.spinner("Writing a tailored cover letter..."):
-                        cover_letter_prompt = f"""
-                        You are a professional career writer. Your task is to write a concise and compelling cover letter and suggest an email subject line.
-                        **Instructions:**
-                        1.  Write a professional email subject line for the application.
-                        2.  Write a cover letter (no more than 250 words) that highlights the top 2-3 most relevant skills from the resume that match the job description.
-                        **User's Resume:**
-                        ---
-                        {edited_text}
-                        ---
-                        **Target Job Description:**
-                        ---
-                        {job_description}
-                        ---
-                        """
+                        cover_letter_prompt = build_cover_letter_prompt(edited_text, job_description)
                         try:
-                            response = model.generate_content(cover_letter_prompt, generation_config=generation_config)
-                            st.session_state.cover_letter_result = response.text
+                            save_result("cover_letter_result", generate_text(cover_letter_prompt))
                         except Exception as e:
                             st.error(f"An error occurred during cover letter generation: {e}")
 
-                if not job_description and not st.session_state.cover_letter_result:
+                cover_letter_result = load_result("cover_letter_result")
+                if not job_description and not cover_letter_result:
                     st.warning("Please paste a job description to enable this feature.")
 
-                if st.session_state.cover_letter_result:
-                    st.code(st.session_state.cover_letter_result)
+                if cover_letter_result:
+                    st.code(cover_letter_result)
                     st.download_button(
                         label="Download Cover Letter as TXT",
-                        data=st.session_state.cover_letter_result,
+                        data=cover_letter_result,
                         file_name="cover_letter.txt",
                         mime="text/plain"
                     )
+
+                st.divider()
+                st.subheader("Bulk Cover Letters")
+                st.info("Applying to many roles? Paste several job descriptions separated by a line containing only `---`, or upload a CSV (one job description per row) or multiple TXT files.")
+                bulk_job_text = st.text_area("Paste multiple job descriptions here")
+                bulk_job_files = st.file_uploader("Upload job descriptions (CSV or TXT)", type=["csv", "txt", "md"], accept_multiple_files=True)
+                bulk_jobs = parse_job_descriptions(bulk_job_text, bulk_job_files)
+                if bulk_jobs:
+                    st.caption(f"{len(bulk_jobs)} job descriptions ready.")
+                if st.button("Generate All Cover Letters", disabled=not bulk_jobs, type="primary"):
+                    progress = st.progress(0, text="Building your resume profile...")
+                    try:
+                        resume_profile = get_resume_profile(edited_text, target_job, include_assessment=False)
+                        generate_bulk_cover_letters(resume_profile, bulk_jobs, progress)
+                    except Exception as e:
+                        st.error(f"An error occurred during bulk cover letter generation: {e}")
+
+                bulk_cover_letters_zip = load_result("bulk_cover_letters_zip", None)
+                if bulk_cover_letters_zip:
+                    st.success(f"Generated {st.session_state.bulk_cover_letters_count} cover letters.")
+                    st.download_button(
+                        label="Download All Cover Letters as ZIP",
+                        data=bulk_cover_letters_zip,
+                        file_name="cover_letters.zip",
+                        mime="application/zip"
+                    )
+
+        stats = st.session_state.long_document_stats
+        if stats and stats["resume_hash"] == hashlib.sha256(edited_text.encode("utf-8")).hexdigest():
+            summary = f"Long-document mode: ~{stats['tokens']:,} tokens split into {stats['chunks']} chunks."
+            if stats["computed_chunks"] == stats["chunks"] and stats["wall_time"] > 0:
+                summary += (
+                    f" Map-phase parallel speedup: {stats['sequential_time'] / stats['wall_time']:.1f}x "
+                    f"({stats['wall_time']:.1f}s in parallel vs {stats['sequential_time']:.1f}s of chunk model calls, excluding rate-limit waits)."
+                )
+            elif stats["computed_chunks"] < stats["chunks"]:
+                summary += f" Notes for {stats['chunks'] - stats['computed_chunks']} chunks were reused from the cache."
+            st.caption(summary)
+
+        usage = session_store.usage(st.session_state.session_id)
+        st.caption(
+            f"Session storage: {usage['items']} results, {usage['memory_bytes'] / 1024:.1f} KB in memory, "
+            f"{usage['disk_bytes'] / 1024:.1f} KB compressed on disk "
+            f"({usage['raw_bytes'] / 1024:.1f} KB uncompressed) · {usage['active_sessions']} active sessions"
+        )
@@ -0,0 +1,46 @@
+import io
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# --- Bulk Cover Letter Archive ---
+def cover_letter_file_name(index, name):
+    slug = re.sub(r'[^A-Za-z0-9]+', '_', name).strip('_')[:50] or "job"
+    return f"{index:02d}_{slug}.txt"
+
+def build_cover_letter_archive(jobs, write_letter, max_workers, on_progress=None, on_finish=None):
+    # Runs write_letter(job_description) for every (name, job_description) pair on a capped
+    # thread pool and adds each letter to a ZIP archive as soon as it completes. Failed
+    # letters are listed in errors.txt. on_finish(archive, generated) is called even when
+    # the run is interrupted (e.g. a Streamlit rerun raised from on_progress), so the
+    # letters finished so far are never thrown away.
+    buffer = io.BytesIO()
+    failures = []
+    generated = 0
+    archive = zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            executor.submit(write_letter, jd): (i, name)
+            for i, (name, jd) in enumerate(jobs, start=1)
+        }
+        for done, future in enumerate(as_completed(futures), start=1):
+            i, name = futures[future]
+            try:
+                archive.writestr(cover_letter_file_name(i, name), future.result())
+                generated += 1
+            except Exception as e:
+                failures.append(f"{cover_letter_file_name(i, name)}: {e}")
+            if on_progress:
+                on_progress(done, len(jobs))
+    except BaseException as e:
+        failures.append(f"Bulk generation stopped after {generated} of {len(jobs)} letters: {e!r}")
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        if failures:
+            archive.writestr("errors.txt", "\n".join(failures))
+        archive.close()
+        if on_finish:
+            on_finish(buffer.getvalue(), generated)
+    return buffer.getvalue(), generated
@@ -0,0 +1,238 @@
+import os
+import time
+import uuid
+import sqlite3
+import zlib
+import shutil
+import threading
+from collections import OrderedDict
+
+# --- Private Files ---
+# Everything written here is derived from a user's resume, so directories and
+# files are only readable by the user running the app.
+def make_private_dir(path):
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # Ownership and mode bits only apply on POSIX; on Windows the per-user profile
+    # directory (the default location) already limits access.
+    if hasattr(os, "getuid"):
+        if os.stat(path).st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by another user.")
+        os.chmod(path, 0o700)
+
+def write_private_file(path, data):
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+
+
+# --- Session Result Store ---
+class SessionResultStore:
+    def __init__(self, root, inline_limit, ttl, max_sessions):
+        self.root = root
+        self.inline_limit = inline_limit
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        # session_id -> {"last_seen": float, "values": {key: handle}}, least recently used first
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        make_private_dir(root)
+        self._remove_orphaned_directories()
+        # Workers share the root but each process writes only to its own directory, whose
+        # mtime is refreshed while it serves sessions.
+        self.process_dir = os.path.join(root, f"process-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+        make_private_dir(self.process_dir)
+        self._next_heartbeat = 0
+
+    def _remove_orphaned_directories(self):
+        # Clean up blobs of processes that stopped serving sessions. A live process refreshes
+        # its directory at least every ttl / 4, so twice the TTL never hits an active worker.
+        cutoff = time.time() - 2 * self.ttl
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _heartbeat(self):
+        now = time.time()
+        if now >= self._next_heartbeat:
+            self._next_heartbeat = now + self.ttl / 4
+            try:
+                os.utime(self.process_dir)
+            except OSError:
+                pass
+
+    def _touch(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = {"last_seen": time.time(), "values": {}}
+        session["last_seen"] = time.time()
+        self._sessions.move_to_end(session_id)
+        return session
+
+    def _drop(self, session_id):
+        self._sessions.pop(session_id, None)
+        shutil.rmtree(os.path.join(self.process_dir, session_id), ignore_errors=True)
+
+    def evict_idle(self):
+        with self._lock:
+            self._heartbeat()
+            cutoff = time.time() - self.ttl
+            evicted = 0
+            while self._sessions:
+                session_id, session = next(iter(self._sessions.items()))
+                if session["last_seen"] >= cutoff and len(self._sessions) <= self.max_sessions:
+                    break
+                self._drop(session_id)
+                evicted += 1
+            return evicted
+
+    def put(self, session_id, key, value):
+        is_bytes = isinstance(value, bytes)
+        data = value if is_bytes else (value or "").encode("utf-8")
+        with self._lock:
+            session = self._touch(session_id)
+            self._discard(session_id, session, key)
+            if len(data) <= self.inline_limit:
+                session["values"][key] = {"inline": value, "size": len(data)}
+            else:
+                directory = os.path.join(self.process_dir, session_id)
+                make_private_dir(directory)
+                path = os.path.join(directory, f"{key}.zlib")
+                compressed = zlib.compress(data, 6)
+                write_private_file(path, compressed)
+                session["values"][key] = {"path": path, "is_bytes": is_bytes,
+                                          "size": len(data), "stored": len(compressed)}
+        self.evict_idle()
+
+    def get(self, session_id, key, default=""):
+        # Reads never create a session entry; they only refresh an existing one.
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None:
+                session["last_seen"] = time.time()
+                self._sessions.move_to_end(session_id)
+            handle = session["values"].get(key) if session else None
+        self.evict_idle()
+        if handle is None:
+            return default
+        if "inline" in handle:
+            return handle["inline"]
+        try:
+            with open(handle["path"], "rb") as f:
+                data = zlib.decompress(f.read())
+        except OSError:
+            return default
+        return data if handle["is_bytes"] else data.decode("utf-8")
+
+    def _discard(self, session_id, session, key):
+        handle = session["values"].pop(key, None)
+        if handle and "path" in handle:
+            try:
+                os.remove(handle["path"])
+            except OSError:
+                pass
+
+    def usage(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id, {"values": {}})
+            handles = list(session["values"].values())
+        return {
+            "items": len(handles),
+            "memory_bytes": sum(h["size"] for h in handles if "inline" in h),
+            "disk_bytes": sum(h["stored"] for h in handles if "path" in h),
+            "raw_bytes": sum(h["size"] for h in handles),
+            "active_sessions": len(self._sessions),
+        }
+
+
+# --- Shared Cache & Rate-Limit Backends ---
+# Both backends expose get(key), set(key, value, ttl) and acquire(name, limit, window).
+CACHE_PURGE_INTERVAL_SECONDS = 5 * 60
+
+class SQLiteBackend:
+    def __init__(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        if not os.path.isdir(directory):
+            make_private_dir(directory)
+        # Create the database file owner-only; SQLite gives its WAL and SHM files the same mode.
+        os.close(os.open(path, os.O_RDWR | os.O_CREAT, 0o600))
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._next_purge = 0
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, expires_at REAL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS rate_limit (bucket TEXT PRIMARY KEY, count INTEGER, expires_at REAL)")
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT value, expires_at FROM cache WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key, value, ttl):
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                               (key, value, now + ttl))
+            if now >= self._next_purge:
+                self._next_purge = now + CACHE_PURGE_INTERVAL_SECONDS
+                self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (now,))
+
+    def acquire(self, name, limit, window):
+        # Fixed-window counter; BEGIN IMMEDIATE serialises the increment across processes.
+        now = time.time()
+        bucket = f"{name}:{int(now // window)}"
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM rate_limit WHERE expires_at < ?", (now,))
+                row = self._conn.execute("SELECT count FROM rate_limit WHERE bucket = ?", (bucket,)).fetchone()
+                count = row[0] if row else 0
+                if count >= limit:
+                    self._conn.execute("COMMIT")
+                    return False
+                self._conn.execute("INSERT OR REPLACE INTO rate_limit (bucket, count, expires_at) VALUES (?, ?, ?)",
+                                   (bucket, count + 1, now + window))
+                self._conn.execute("COMMIT")
+                return True
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+class RedisBackend:
+    # Works with any redis-py compatible client, e.g. redis.Redis or a local fakeredis.FakeRedis.
+    def __init__(self, client, prefix="ai_career_toolkit:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND_URL points to Redis but the `redis` package is not installed.")
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=int(ttl))
+
+    def acquire(self, name, limit, window):
+        bucket = f"{self.prefix}rate:{name}:{int(time.time() // window)}"
+        pipe = self.client.pipeline()
+        pipe.incr(bucket)
+        pipe.expire(bucket, int(window) + 1)
+        count = pipe.execute()[0]
+        return count <= limit
+
+def create_shared_backend(url):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend.from_url(url)
+    if url.startswith("sqlite:///"):
+        return SQLiteBackend(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported CACHE_BACKEND_URL: {url}")
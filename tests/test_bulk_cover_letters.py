@@ -0,0 +1,76 @@
+import io
+import threading
+import zipfile
+
+import pytest
+
+from bulk_cover_letters import build_cover_letter_archive, cover_letter_file_name
+
+JOBS = [("Backend Dev @ Acme", "jd-1"), ("Data Analyst", "jd-2"), ("ML Engineer", "jd-3")]
+
+
+def read_archive(data):
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        return {name: archive.read(name).decode("utf-8") for name in archive.namelist()}
+
+
+def test_cover_letter_file_name_is_numbered_and_safe():
+    assert cover_letter_file_name(3, "Backend Dev @ Acme / Remote") == "03_Backend_Dev_Acme_Remote.txt"
+    assert cover_letter_file_name(1, "!!!") == "01_job.txt"
+
+
+def test_archive_contains_every_letter():
+    data, generated = build_cover_letter_archive(JOBS, lambda jd: f"letter for {jd}", max_workers=2)
+    assert generated == 3
+    assert read_archive(data) == {
+        "01_Backend_Dev_Acme.txt": "letter for jd-1",
+        "02_Data_Analyst.txt": "letter for jd-2",
+        "03_ML_Engineer.txt": "letter for jd-3",
+    }
+
+
+def test_failing_worker_keeps_finished_letters_and_writes_errors():
+    def write_letter(jd):
+        if jd == "jd-2":
+            raise RuntimeError("quota exceeded")
+        return f"letter for {jd}"
+
+    finished = []
+    data, generated = build_cover_letter_archive(
+        JOBS, write_letter, max_workers=2, on_finish=lambda archive, count: finished.append((archive, count))
+    )
+    files = read_archive(data)
+    assert generated == 2
+    assert set(files) == {"01_Backend_Dev_Acme.txt", "03_ML_Engineer.txt", "errors.txt"}
+    assert "02_Data_Analyst.txt: quota exceeded" in files["errors.txt"]
+    assert finished == [(data, 2)]
+
+
+class Interrupted(BaseException):
+    # Stands in for Streamlit's rerun/stop exceptions, which do not derive from Exception.
+    pass
+
+
+def test_interrupted_run_still_saves_partial_archive():
+    release = threading.Event()
+
+    def write_letter(jd):
+        if jd != "jd-1":
+            release.wait(timeout=5)
+        return f"letter for {jd}"
+
+    def on_progress(done, total):
+        raise Interrupted()
+
+    finished = []
+    with pytest.raises(Interrupted):
+        build_cover_letter_archive(
+            JOBS, write_letter, max_workers=3, on_progress=on_progress,
+            on_finish=lambda archive, count: finished.append((archive, count)),
+        )
+    release.set()
+    archive, generated = finished[0]
+    files = read_archive(archive)
+    assert generated == 1
+    assert files["01_Backend_Dev_Acme.txt"] == "letter for jd-1"
+    assert "stopped after 1 of 3 letters" in files["errors.txt"]
@@ -0,0 +1,164 @@
+import os
+import stat
+import time
+
+import pytest
+
+import storage
+from storage import RedisBackend, SQLiteBackend, SessionResultStore, create_shared_backend
+
+
+def make_store(tmp_path, ttl=60, max_sessions=10):
+    return SessionResultStore(str(tmp_path / "sessions"), inline_limit=16, ttl=ttl, max_sessions=max_sessions)
+
+
+def test_session_store_round_trips_inline_and_offloaded_values(tmp_path):
+    store = make_store(tmp_path)
+    store.put("a", "short", "hi")
+    store.put("a", "long", "x" * 5000)
+    store.put("a", "archive", b"\x00" * 5000)
+    assert store.get("a", "short") == "hi"
+    assert store.get("a", "long") == "x" * 5000
+    assert store.get("a", "archive") == b"\x00" * 5000
+    assert store.get("a", "missing", None) is None
+    usage = store.usage("a")
+    assert usage["items"] == 3
+    assert usage["memory_bytes"] == 2
+    assert usage["raw_bytes"] == 10002
+    assert 0 < usage["disk_bytes"] < 10000
+
+
+def test_session_store_files_are_private(tmp_path):
+    store = make_store(tmp_path)
+    store.put("a", "long", "x" * 5000)
+    session_dir = tmp_path / "sessions" / os.path.basename(store.process_dir) / "a"
+    assert stat.S_IMODE(os.stat(tmp_path / "sessions").st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(store.process_dir).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(session_dir).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(session_dir / "long.zlib").st_mode) == 0o600
+
+
+def test_session_store_reads_do_not_create_sessions(tmp_path):
+    store = make_store(tmp_path, max_sessions=2)
+    for i in range(5):
+        assert store.get(f"reader-{i}", "general_result") == ""
+    assert store.usage("any")["active_sessions"] == 0
+
+
+def test_session_store_evicts_least_recently_used_beyond_cap(tmp_path):
+    store = make_store(tmp_path, max_sessions=2)
+    store.put("a", "long", "x" * 5000)
+    store.put("b", "k", "v")
+    store.get("a", "long")
+    store.put("c", "k", "v")
+    assert store.get("b", "k", None) is None
+    assert store.get("a", "long") == "x" * 5000
+    assert store.usage("a")["active_sessions"] == 2
+
+
+def test_session_store_evicts_idle_sessions_and_their_files(tmp_path):
+    store = make_store(tmp_path, ttl=0.05)
+    store.put("a", "long", "x" * 5000)
+    time.sleep(0.1)
+    assert store.evict_idle() == 1
+    assert not os.path.exists(os.path.join(store.process_dir, "a"))
+
+
+def test_new_worker_keeps_blobs_of_active_worker(tmp_path):
+    first = make_store(tmp_path, ttl=60)
+    first.put("a", "long", "x" * 5000)
+    # The blob was written long ago, but the session is still being read.
+    old = time.time() - 3600
+    os.utime(os.path.join(first.process_dir, "a", "long.zlib"), (old, old))
+    os.utime(os.path.join(first.process_dir, "a"), (old, old))
+    first.get("a", "long")
+    make_store(tmp_path, ttl=60)
+    assert first.get("a", "long") == "x" * 5000
+
+
+def test_new_worker_removes_orphaned_process_directories(tmp_path):
+    first = make_store(tmp_path, ttl=60)
+    first.put("a", "long", "x" * 5000)
+    old = time.time() - 3600
+    os.utime(first.process_dir, (old, old))
+    second = make_store(tmp_path, ttl=60)
+    assert not os.path.exists(first.process_dir)
+    assert os.path.isdir(second.process_dir)
+
+
+def make_sqlite_backend(tmp_path):
+    return SQLiteBackend(str(tmp_path / "data" / "cache.db"))
+
+
+def make_redis_backend(tmp_path):
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisBackend(fakeredis.FakeRedis())
+
+
+@pytest.fixture(params=[make_sqlite_backend, make_redis_backend], ids=["sqlite", "redis"])
+def backend(request, tmp_path):
+    return request.param(tmp_path)
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_backend_cache_round_trip_and_expiry(backend, monkeypatch):
+    backend.set("response:a", b"hello", 60)
+    assert backend.get("response:a") == b"hello"
+    assert backend.get("response:missing") is None
+    if isinstance(backend, SQLiteBackend):
+        clock = FakeClock(time.time() + 61)
+        monkeypatch.setattr(storage.time, "time", clock)
+        assert backend.get("response:a") is None
+
+
+def test_backend_acquire_enforces_limit_within_window(backend, monkeypatch):
+    clock = FakeClock(1_000_020.0)
+    monkeypatch.setattr(storage.time, "time", clock)
+    assert [backend.acquire("gemini", 3, 60) for _ in range(5)] == [True, True, True, False, False]
+    assert backend.acquire("other", 3, 60)
+
+
+def test_backend_acquire_resets_in_next_window(backend, monkeypatch):
+    clock = FakeClock(1_000_020.0)
+    monkeypatch.setattr(storage.time, "time", clock)
+    assert [backend.acquire("gemini", 2, 60) for _ in range(3)] == [True, True, False]
+    clock.now += 60
+    assert [backend.acquire("gemini", 2, 60) for _ in range(3)] == [True, True, False]
+
+
+def test_sqlite_backend_budget_is_shared_between_connections(tmp_path):
+    first = make_sqlite_backend(tmp_path)
+    second = make_sqlite_backend(tmp_path)
+    first.set("extraction:a", b"text", 60)
+    assert second.get("extraction:a") == b"text"
+    assert first.acquire("gemini", 2, 60)
+    assert second.acquire("gemini", 2, 60)
+    assert not first.acquire("gemini", 2, 60)
+
+
+def test_sqlite_backend_files_are_private(tmp_path):
+    make_sqlite_backend(tmp_path)
+    assert stat.S_IMODE(os.stat(tmp_path / "data").st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(tmp_path / "data" / "cache.db").st_mode) == 0o600
+
+
+def test_create_shared_backend_rejects_unknown_urls(tmp_path):
+    assert isinstance(create_shared_backend(f"sqlite:///{tmp_path}/cache.db"), SQLiteBackend)
+    with pytest.raises(ValueError):
+        create_shared_backend("memcached://localhost")
+
+
+def test_make_private_dir_without_getuid(tmp_path, monkeypatch):
+    # Windows has no os.getuid; the directory is still created and usable.
+    monkeypatch.delattr(storage.os, "getuid")
+    storage.make_private_dir(str(tmp_path / "data"))
+    store = SessionResultStore(str(tmp_path / "data" / "sessions"), inline_limit=16, ttl=60, max_sessions=10)
+    store.put("a", "long", "x" * 5000)
+    assert store.get("a", "long") == "x" * 5000
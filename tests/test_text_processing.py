@@ -0,0 +1,139 @@
+import json
+
+import pytest
+
+from text_processing import (
+    chunk_resume,
+    estimate_tokens,
+    format_dossier,
+    parse_dossier,
+    parse_job_file,
+    split_into_sections,
+    split_oversized,
+    split_pasted_job_descriptions,
+)
+
+
+def test_split_pasted_job_descriptions_on_separator_lines():
+    text = "Data Analyst at Acme\nSQL, Python\n---\n\n  ----  \nML Engineer\nPyTorch\n"
+    jobs = split_pasted_job_descriptions(text)
+    assert [name for name, _ in jobs] == ["Data Analyst at Acme", "ML Engineer"]
+    assert jobs[1][1] == "ML Engineer\nPyTorch"
+
+
+def test_split_pasted_job_descriptions_empty():
+    assert split_pasted_job_descriptions("") == []
+    assert split_pasted_job_descriptions(None) == []
+
+
+def test_parse_job_file_csv_uses_named_columns_and_skips_blanks():
+    data = b"Title,Job Description\nBackend Dev,Build APIs\nEmpty,\nFrontend Dev,Build UIs\n"
+    assert parse_job_file("jobs.csv", data) == [("Backend Dev", "Build APIs"), ("Frontend Dev", "Build UIs")]
+
+
+def test_parse_job_file_csv_falls_back_to_last_column():
+    data = b"id,text\n1,First posting\n2,Second posting\n"
+    assert parse_job_file("postings.csv", data) == [("postings_1", "First posting"), ("postings_2", "Second posting")]
+
+
+def test_parse_job_file_text():
+    assert parse_job_file("acme.txt", b"  Senior Python Developer  \n") == [("acme", "Senior Python Developer")]
+    assert parse_job_file("empty.txt", b"   ") == []
+
+
+def test_split_into_sections_on_headings():
+    text = "JANE DOE\njane@example.com\nEducation\nPhD, 2015\nPUBLICATIONS\n1. Paper"
+    assert [section.splitlines()[0] for section in split_into_sections(text)] == ["JANE DOE", "Education", "PUBLICATIONS"]
+
+
+def test_split_oversized_falls_back_from_paragraphs_to_lines():
+    lines = "\n".join(f"{i}. A fairly long publication title, Journal of Things, 2015." for i in range(2000))
+    text = "PUBLICATIONS\n\nShort intro paragraph.\n\n" + lines
+    pieces = split_oversized(text, 500)
+    assert all(estimate_tokens(piece) <= 500 for piece in pieces)
+    assert "".join(pieces).replace("\n", "") == text.replace("\n", "")
+
+
+def test_split_oversized_hard_splits_a_single_line():
+    text = "x" * 50_000
+    pieces = split_oversized(text, 2500)
+    assert all(estimate_tokens(piece) <= 2500 for piece in pieces)
+    assert "".join(pieces) == text
+
+
+def test_chunk_resume_respects_budget_for_long_publication_list():
+    paragraph = " ".join(f"Author et al. Paper {i}. Venue {i}, 2016." for i in range(8000))
+    cv = "JANE DOE\nEducation\nPhD, 2015\n\nPUBLICATIONS\n" + paragraph + "\n\nExperience\nProfessor, 2016-now\n"
+    chunks = chunk_resume(cv, 2500)
+    assert len(chunks) > 1
+    assert all(estimate_tokens(chunk) <= 2500 for chunk in chunks)
+    assert chunks[0].startswith("JANE DOE")
+    assert chunks[-1].rstrip().endswith("Professor, 2016-now")
+
+
+def test_chunk_resume_keeps_short_resume_whole():
+    cv = "JANE DOE\nSkills\nPython\nExperience\nEngineer, 2020-now"
+    chunks = chunk_resume(cv, 2500)
+    assert len(chunks) == 1
+    assert chunks[0].replace("\n\n", "\n") == cv
+
+
+DOSSIER = {
+    "name": "Jane Doe",
+    "contact": "jane@example.com",
+    "headline": "Backend engineer",
+    "seniority": "mid",
+    "years_of_experience": 4,
+    "skills": {"technical": ["Python"], "tools": ["Docker"], "soft": ["Mentoring"]},
+    "experience": [{"title": "Engineer", "organization": "Acme", "start": "2021", "end": "now",
+                    "highlights": ["Cut latency by 30%"]}],
+    "education": [{"degree": "BTech", "institution": "VIT", "year": "2020"}],
+    "strengths": ["API design"],
+    "weaknesses": ["Few metrics"],
+    "gaps": ["Kubernetes"],
+}
+
+
+def test_parse_dossier_accepts_complete_profile():
+    assert parse_dossier(json.dumps(DOSSIER)) == DOSSIER
+
+
+@pytest.mark.parametrize("reply", [
+    '{"name": "Jane", "skills": {',
+    json.dumps(["not", "an", "object"]),
+    json.dumps({key: value for key, value in DOSSIER.items() if key != "gaps"}),
+    json.dumps(dict(DOSSIER, strengths="API design")),
+    json.dumps(dict(DOSSIER, experience=["Engineer at Acme 2020-2023"])),
+    json.dumps(dict(DOSSIER, skills={"technical": "Python, SQL"})),
+    json.dumps(dict(DOSSIER, skills={"technical": ["Python", {"name": "SQL"}]})),
+    json.dumps(dict(DOSSIER, experience=[dict(DOSSIER["experience"][0], highlights="Cut latency by 30%")])),
+    json.dumps(dict(DOSSIER, experience=[dict(DOSSIER["experience"][0], title=["Engineer"])])),
+    json.dumps(dict(DOSSIER, education=["BTech, VIT, 2020"])),
+    json.dumps(dict(DOSSIER, gaps=[{"skill": "Kubernetes"}])),
+    json.dumps(dict(DOSSIER, name={"first": "Jane"})),
+])
+def test_parse_dossier_rejects_malformed_replies(reply):
+    with pytest.raises(ValueError):
+        parse_dossier(reply)
+
+
+def test_parse_dossier_accepts_empty_and_partial_records():
+    reply = dict(DOSSIER, experience=[{"title": "Engineer", "organization": "Acme"}], education=[],
+                 skills={"technical": []}, years_of_experience=None)
+    dossier = parse_dossier(json.dumps(reply))
+    assert "- Engineer, Acme ( - )" in format_dossier(dossier)
+
+
+def test_format_dossier_includes_assessment_by_default():
+    text = format_dossier(DOSSIER)
+    assert "- Engineer, Acme (2021 - now)" in text
+    assert "  - Cut latency by 30%" in text
+    assert "Weaknesses:\n- Few metrics" in text
+    assert "Gaps for the target role:\n- Kubernetes" in text
+
+
+def test_format_dossier_without_assessment_omits_weaknesses_and_gaps():
+    text = format_dossier(DOSSIER, include_assessment=False)
+    assert "Strengths:\n- API design" in text
+    assert "Few metrics" not in text
+    assert "Kubernetes" not in text
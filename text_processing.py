@@ -0,0 +1,178 @@
+import io
+import json
+import re
+
+import pandas as pd
+
+# --- Job Description Parsing ---
+JD_SEPARATOR = re.compile(r'^\s*-{3,}\s*$', re.MULTILINE)
+JD_CSV_COLUMNS = ("job_description", "description", "jd", "job description")
+JD_NAME_COLUMNS = ("title", "job_title", "role", "company", "name")
+
+def split_pasted_job_descriptions(pasted_text):
+    # Returns (name, job_description) pairs from text separated by lines containing only `---`.
+    jobs = []
+    for i, block in enumerate(JD_SEPARATOR.split(pasted_text or ""), start=1):
+        if block.strip():
+            first_line = block.strip().splitlines()[0]
+            jobs.append((first_line[:60] or f"job_{i}", block.strip()))
+    return jobs
+
+def parse_job_file(file_name, data):
+    # Returns (name, job_description) pairs from an uploaded CSV (one row per job) or TXT file.
+    if file_name.endswith('.csv'):
+        jobs = []
+        df = pd.read_csv(io.BytesIO(data))
+        columns = {c.lower().strip(): c for c in df.columns}
+        jd_column = next((columns[c] for c in JD_CSV_COLUMNS if c in columns), df.columns[-1])
+        name_column = next((columns[c] for c in JD_NAME_COLUMNS if c in columns), None)
+        for i, row in df.iterrows():
+            jd = str(row[jd_column]).strip()
+            if jd and jd.lower() != "nan":
+                name = str(row[name_column]) if name_column else f"{file_name.rsplit('.', 1)[0]}_{i + 1}"
+                jobs.append((name, jd))
+        return jobs
+    jd = data.decode("utf-8", errors="ignore").strip()
+    return [(file_name.rsplit('.', 1)[0], jd)] if jd else []
+
+
+# --- Long Document Chunking ---
+SECTION_KEYWORDS = re.compile(
+    r'^\s*(summary|profile|objective|education|experience|work experience|professional experience|'
+    r'employment|research|research experience|publications|selected publications|conference papers|'
+    r'journal articles|presentations|talks|teaching|grants|funding|awards|honors|projects|skills|'
+    r'technical skills|certifications|service|professional service|patents|references)\b[\w &/,-]{0,30}:?\s*$',
+    re.IGNORECASE
+)
+SECTION_CAPS = re.compile(r'^\s*[A-Z][A-Z &/,-]{2,40}:?\s*$')
+
+def estimate_tokens(text):
+    return len(text) // 4
+
+def split_into_sections(text):
+    sections = []
+    current = []
+    for line in text.splitlines():
+        if (SECTION_KEYWORDS.match(line) or SECTION_CAPS.match(line)) and current:
+            sections.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        sections.append("\n".join(current))
+    return [section for section in sections if section.strip()]
+
+def split_oversized(text, budget):
+    # Split at paragraph, then line, then hard character boundaries until every piece fits the budget.
+    if estimate_tokens(text) <= budget:
+        return [text]
+    for separator in ("\n\n", "\n"):
+        if separator in text:
+            pieces = []
+            current = ""
+            for unit in text.split(separator):
+                for part in split_oversized(unit, budget):
+                    if current and estimate_tokens(current + separator + part) > budget:
+                        pieces.append(current)
+                        current = part
+                    else:
+                        current = current + separator + part if current else part
+            if current:
+                pieces.append(current)
+            return pieces
+    size = budget * 4
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+def chunk_resume(text, budget):
+    chunks = []
+    current = ""
+    for section in split_into_sections(text):
+        for piece in split_oversized(section, budget):
+            if current and estimate_tokens(current + "\n\n" + piece) > budget:
+                chunks.append(current)
+                current = piece
+            else:
+                current = current + "\n\n" + piece if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+# --- Resume Dossier ---
+DOSSIER_KEYS = ("name", "contact", "headline", "seniority", "years_of_experience", "skills",
+                "experience", "education", "strengths", "weaknesses", "gaps")
+DOSSIER_TEXT_KEYS = ("name", "contact", "headline", "seniority")
+DOSSIER_STRING_LIST_KEYS = ("strengths", "weaknesses", "gaps")
+DOSSIER_RECORD_KEYS = {
+    "experience": ("title", "organization", "start", "end"),
+    "education": ("degree", "institution", "year"),
+}
+
+def is_scalar(value):
+    return value is None or isinstance(value, (str, int, float))
+
+def is_string_list(value):
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def validate_dossier_shape(dossier):
+    # Checks the nested types format_dossier relies on, so a malformed profile is rejected
+    # before it can be cached.
+    if not all(is_scalar(dossier[key]) for key in DOSSIER_TEXT_KEYS + ("years_of_experience",)):
+        return "text fields must be strings"
+    skills = dossier["skills"]
+    if not isinstance(skills, dict) or not all(is_string_list(value) for value in skills.values()):
+        return "skills must map to lists of strings"
+    if not all(is_string_list(dossier[key]) for key in DOSSIER_STRING_LIST_KEYS):
+        return "strengths, weaknesses and gaps must be lists of strings"
+    for key, fields in DOSSIER_RECORD_KEYS.items():
+        records = dossier[key]
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            return f"{key} must be a list of objects"
+        if not all(is_scalar(record.get(field)) for record in records for field in fields):
+            return f"{key} entries must have text fields"
+    if not all(is_string_list(role.get("highlights") or []) for role in dossier["experience"]):
+        return "experience highlights must be lists of strings"
+    return None
+
+def parse_dossier(text):
+    # Raises ValueError unless the model reply is a JSON object with every expected key
+    # and the nested shapes format_dossier expects.
+    try:
+        dossier = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"The resume profile is not valid JSON: {e}")
+    if not isinstance(dossier, dict):
+        raise ValueError("The resume profile is not a JSON object.")
+    missing = [key for key in DOSSIER_KEYS if key not in dossier]
+    if missing:
+        raise ValueError(f"The resume profile is missing: {', '.join(missing)}")
+    problem = validate_dossier_shape(dossier)
+    if problem:
+        raise ValueError(f"The resume profile has fields of the wrong type: {problem}.")
+    return dossier
+
+def format_dossier(dossier, include_assessment=True):
+    # Compact plain-text rendering of the dossier for downstream prompts. Cover letters
+    # pass include_assessment=False to leave out weaknesses and target-role gaps.
+    skills = dossier.get("skills") or {}
+    lines = [
+        f"Name: {dossier.get('name', '')}",
+        f"Contact: {dossier.get('contact', '')}",
+        f"Headline: {dossier.get('headline', '')}",
+        f"Seniority: {dossier.get('seniority', '')} ({dossier.get('years_of_experience', '')} years of experience)",
+        f"Technical skills: {', '.join(skills.get('technical') or [])}",
+        f"Tools: {', '.join(skills.get('tools') or [])}",
+        f"Soft skills: {', '.join(skills.get('soft') or [])}",
+        "Experience:",
+    ]
+    for role in dossier.get("experience") or []:
+        lines.append(f"- {role.get('title', '')}, {role.get('organization', '')} ({role.get('start', '')} - {role.get('end', '')})")
+        lines.extend(f"  - {highlight}" for highlight in role.get("highlights") or [])
+    lines.append("Education:")
+    lines.extend(f"- {e.get('degree', '')}, {e.get('institution', '')} {e.get('year', '')}".rstrip() for e in dossier.get("education") or [])
+    sections = [("Strengths", "strengths")]
+    if include_assessment:
+        sections += [("Weaknesses", "weaknesses"), ("Gaps for the target role", "gaps")]
+    for label, field in sections:
+        lines.append(f"{label}:")
+        lines.extend(f"- {item}" for item in dossier.get(field) or [])
+    return "\n".join(lines)